@@ -5,7 +5,7 @@ from typing import Annotated, cast
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from app.models import ConversationMode, RoleType
+from app.models import ConversationMode, RoleType, Room
 from app.orchestrator import RoomManager
 
 router = APIRouter(prefix="/api")
@@ -62,16 +62,26 @@ def get_room_manager(request: Request) -> RoomManager:
 RoomManagerDep = Annotated[RoomManager, Depends(get_room_manager)]
 
 
-def build_room_response(room_id: str, manager: RoomManager) -> RoomResponse:
-    room = manager.get_room(room_id)
-    return RoomResponse(
+def get_room(room_id: str, manager: RoomManagerDep) -> Room:
+    room = manager.find_room(room_id)
+    if room is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found.")
+    return room
+
+
+RoomDep = Annotated[Room, Depends(get_room)]
+
+
+def build_room_response(room: Room) -> RoomResponse:
+    # Room state is validated on the way in, so skip re-validating it here.
+    return RoomResponse.model_construct(
         room_id=room.room_id,
         subject=room.subject,
         conversation_mode=room.conversation_mode,
         global_instruction=room.global_instruction,
         turn_interval_seconds=room.turn_interval_seconds,
         agents=[
-            AgentResponse(
+            AgentResponse.model_construct(
                 agent_id=agent.agent_id,
                 model=agent.model,
                 display_name=agent.display_name,
@@ -84,7 +94,7 @@ def build_room_response(room_id: str, manager: RoomManager) -> RoomResponse:
 
 
 @router.post("/room/create", response_model=RoomResponse)
-def create_room(payload: CreateRoomRequest, manager: RoomManagerDep) -> RoomResponse:
+async def create_room(payload: CreateRoomRequest, manager: RoomManagerDep) -> RoomResponse:
     room = manager.create_room(
         subject=payload.subject,
         models=payload.models,
@@ -93,100 +103,66 @@ def create_room(payload: CreateRoomRequest, manager: RoomManagerDep) -> RoomResp
         turn_interval_seconds=payload.turn_interval_seconds,
         seed=payload.seed,
     )
-    return build_room_response(room.room_id, manager)
+    return build_room_response(room)
 
 
 @router.post("/room/{room_id}/start", response_model=StatusResponse)
 async def start_room(
-    room_id: str,
+    room: RoomDep,
     payload: StartRoomRequest,
     manager: RoomManagerDep,
 ) -> StatusResponse:
-    try:
-        await manager.start_room(room_id=room_id, max_rounds=payload.max_rounds)
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+    await manager.start_room(room_id=room.room_id, max_rounds=payload.max_rounds)
     return StatusResponse(status="running")
 
 
 @router.post("/room/{room_id}/stop", response_model=StatusResponse)
-async def stop_room(room_id: str, manager: RoomManagerDep) -> StatusResponse:
-    try:
-        await manager.stop_room(room_id=room_id)
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+async def stop_room(room: RoomDep, manager: RoomManagerDep) -> StatusResponse:
+    await manager.stop_room(room_id=room.room_id)
     return StatusResponse(status="stopped")
 
 
 @router.post("/room/{room_id}/pause", response_model=StatusResponse)
-async def pause_room(room_id: str, manager: RoomManagerDep) -> StatusResponse:
-    try:
-        await manager.pause_room(room_id=room_id)
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+async def pause_room(room: RoomDep, manager: RoomManagerDep) -> StatusResponse:
+    await manager.pause_room(room_id=room.room_id)
     return StatusResponse(status="paused")
 
 
 @router.post("/room/{room_id}/resume", response_model=StatusResponse)
-async def resume_room(room_id: str, manager: RoomManagerDep) -> StatusResponse:
-    try:
-        await manager.resume_room(room_id=room_id)
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+async def resume_room(room: RoomDep, manager: RoomManagerDep) -> StatusResponse:
+    await manager.resume_room(room_id=room.room_id)
     return StatusResponse(status="running")
 
 
 @router.post("/room/{room_id}/conclude", response_model=StatusResponse)
-async def conclude_room(room_id: str, manager: RoomManagerDep) -> StatusResponse:
-    try:
-        await manager.stop_room(room_id=room_id, reason="user_concluded")
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+async def conclude_room(room: RoomDep, manager: RoomManagerDep) -> StatusResponse:
+    await manager.stop_room(room_id=room.room_id, reason="user_concluded")
     return StatusResponse(status="concluded")
 
 
 @router.post("/room/{room_id}/config", response_model=RoomResponse)
 async def update_room_config(
-    room_id: str,
+    room: RoomDep,
     payload: UpdateRoomConfigRequest,
     manager: RoomManagerDep,
 ) -> RoomResponse:
     try:
         room = await manager.update_room_config(
-            room_id=room_id,
+            room_id=room.room_id,
             conversation_mode=payload.conversation_mode,
             global_instruction=payload.global_instruction,
             turn_interval_seconds=payload.turn_interval_seconds,
         )
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
-    return build_room_response(room.room_id, manager)
+    return build_room_response(room)
 
 
 @router.post("/room/{room_id}/user-message", response_model=StatusResponse)
 async def add_user_message(
-    room_id: str,
+    room: RoomDep,
     payload: UserMessageRequest,
     manager: RoomManagerDep,
 ) -> StatusResponse:
-    try:
-        await manager.add_user_message(room_id=room_id, content=payload.content)
-    except KeyError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found."
-        ) from exc
+    await manager.add_user_message(room_id=room.room_id, content=payload.content)
     return StatusResponse(status="accepted")
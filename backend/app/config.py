@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
@@ -22,8 +23,21 @@ class Settings(BaseSettings):
     openrouter_api_key: str = Field(default="")
     openrouter_base_url: str = Field(default="https://openrouter.ai/api/v1")
     model_temperature: float = Field(default=0.9, ge=0.0, le=2.0)
+    # Recent messages sent per turn: at least this many, growing to 1.5x before the oldest
+    # half is evicted. Fewer are sent when they would not fit HISTORY_MAX_CHARS; whole
+    # messages are dropped from the head, never cut.
     history_limit: int = Field(default=16, ge=1)
     default_max_rounds: int = Field(default=240, ge=1)
-    loop_interval_seconds: float = Field(default=0.5, ge=0.0)
     max_consecutive_failures: int = Field(default=3, ge=1)
+    # Retries after a failed turn wait at least this long, even in rooms with a 0 s interval.
+    min_failure_backoff_seconds: float = Field(default=0.5, gt=0.0)
+    max_failure_backoff_seconds: float = Field(default=8.0, gt=0.0)
+    max_concurrent_llm_calls: int = Field(default=16, ge=1)
+    parallel_agents_per_round: int = Field(default=1, ge=1)
+    ws_send_timeout_seconds: float = Field(default=5.0, gt=0.0)
     cors_origins: list[str] = Field(default_factory=lambda: ["http://localhost:5173"])
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
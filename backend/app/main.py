@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import router
-from app.config import Settings
+from app.config import get_settings
 from app.openrouter import OpenRouterClient
 from app.orchestrator import RoomManager
 
 
 def create_app() -> FastAPI:
-    settings = Settings()
+    settings = get_settings()
     llm_client = OpenRouterClient(
         api_key=settings.openrouter_api_key,
         base_url=settings.openrouter_base_url,
@@ -18,7 +22,18 @@ def create_app() -> FastAPI:
     )
     manager = RoomManager(llm_client=llm_client, settings=settings)
 
-    app = FastAPI(title="LLM Chat Room", version="0.1.0")
+    @contextlib.asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        warm_up = asyncio.create_task(llm_client.warm_up())
+        yield
+        warm_up.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up
+        # Rooms share the HTTP client, so stop their loops before closing it.
+        await manager.shutdown()
+        await llm_client.aclose()
+
+    app = FastAPI(title="LLM Chat Room", version="0.1.0", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from random import Random
@@ -12,6 +13,8 @@ MessageRole = Literal["user", "agent"]
 RoleType = Literal["facilitator", "character"]
 ConversationMode = Literal["philosophy_debate", "devils_advocate", "consensus_lab"]
 
+GENERATION_LOG_LIMIT = 120
+
 
 def utc_now_iso() -> str:
     return datetime.now(UTC).isoformat()
@@ -46,6 +49,12 @@ class AgentSpec:
     persona_prompt: str
 
 
+def _set_event() -> asyncio.Event:
+    event = asyncio.Event()
+    event.set()
+    return event
+
+
 @dataclass(slots=True)
 class Room:
     room_id: str
@@ -57,10 +66,11 @@ class Room:
     global_instruction: str = ""
     turn_interval_seconds: float = 0.5
     messages: list[ChatMessage] = field(default_factory=list)
+    history_start: int = 0
     running: bool = False
     task: asyncio.Task[None] | None = None
     last_speaker_id: str | None = None
-    pending_priority_message: ChatMessage | None = None
+    pending_priority_messages: deque[ChatMessage] = field(default_factory=deque)
     fail_streak: int = 0
     rounds_completed: int = 0
     current_act: str = "導入"
@@ -69,6 +79,10 @@ class Room:
     stop_requested: bool = False
     stop_reason: str | None = None
     end_reason: str | None = None
-    generation_logs: list[GenerationLog] = field(default_factory=list)
+    generation_logs: deque[GenerationLog] = field(
+        default_factory=lambda: deque(maxlen=GENERATION_LOG_LIMIT)
+    )
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    resumed: asyncio.Event = field(default_factory=_set_event)
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
     ws_connections: set[WebSocket] = field(default_factory=set)
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import contextlib
+import re
+from collections import deque
+from functools import lru_cache
 from typing import Protocol
 
 import httpx
 
 from app.models import ChatMessage, ConversationMode, RoleType
 
+HISTORY_MAX_CHARS = 6000
+ERROR_DETAIL_MAX_CHARS = 1024
+TEMPERATURE_RETRY_PATTERN = re.compile(
+    r"temperature|unsupported value|unsupported parameter|sampling", re.IGNORECASE
+)
+
+
+def format_history_line(message: ChatMessage) -> str:
+    return f"{message.speaker_id}: {message.content}"
+
+
+def format_priority_line(message: ChatMessage) -> str:
+    return f"user(priority): {message.content}"
+
 
 class LLMClient(Protocol):
     async def generate_reply(
@@ -33,11 +51,33 @@ class OpenRouterClient:
         base_url: str,
         model_temperature: float,
         timeout_seconds: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
+        self._completions_url = f"{self._base_url}/chat/completions"
         self._model_temperature = model_temperature
-        self._timeout = timeout_seconds
+        self._headers = {"Authorization": f"Bearer {api_key}"}
+        self._owns_client = http_client is None
+        # One pooled client for the app lifetime so turns reuse warm connections.
+        self._client = http_client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def warm_up(self) -> None:
+        if not self._api_key:
+            return
+        with contextlib.suppress(httpx.HTTPError):
+            await self._client.get(f"{self._base_url}/models", headers=self._headers)
 
     async def generate_reply(
         self,
@@ -63,54 +103,53 @@ class OpenRouterClient:
             subject=subject,
             conversation_mode=conversation_mode,
             global_instruction=global_instruction,
-            act_name=act_name,
-            act_goal=act_goal,
             persona_prompt=persona_prompt,
         )
         payload = {
             "model": model,
             "temperature": self._model_temperature,
             "messages": [
-                {"role": "system", "content": system_prompt},
+                {
+                    "role": "system",
+                    # Providers that support prompt caching reuse the first block across turns;
+                    # the act changes a few times per room, so it stays outside the cached block.
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": system_prompt,
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {"type": "text", "text": self._build_act_prompt(act_name, act_goal)},
+                    ],
+                },
                 {"role": "user", "content": self._render_history(history, priority_message)},
             ],
         }
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                f"{self._base_url}/chat/completions",
-                json=payload,
-                headers=headers,
-            )
-            if response.is_error:
-                detail = self._extract_error_detail(response)
-                if self._should_retry_without_temperature(response.status_code, detail):
-                    retry_payload = {
-                        "model": model,
-                        "messages": payload["messages"],
-                    }
-                    response = await client.post(
-                        f"{self._base_url}/chat/completions",
-                        json=retry_payload,
-                        headers=headers,
-                    )
-                    if response.is_error:
-                        retry_detail = self._extract_error_detail(response)
-                        raise RuntimeError(
-                            "OpenRouter API error "
-                            f"({response.status_code}) for model '{model}': {retry_detail}"
-                        )
-                else:
+        response = await self._client.post(
+            self._completions_url, json=payload, headers=self._headers
+        )
+        if response.is_error:
+            detail = self._extract_error_detail(response)
+            if self._should_retry_without_temperature(response.status_code, detail):
+                retry_payload = {
+                    "model": model,
+                    "messages": payload["messages"],
+                }
+                response = await self._client.post(
+                    self._completions_url, json=retry_payload, headers=self._headers
+                )
+                if response.is_error:
+                    retry_detail = self._extract_error_detail(response)
                     raise RuntimeError(
                         "OpenRouter API error "
-                        f"({response.status_code}) for model '{model}': {detail}"
+                        f"({response.status_code}) for model '{model}': {retry_detail}"
                     )
+            else:
+                raise RuntimeError(
+                    f"OpenRouter API error ({response.status_code}) for model '{model}': {detail}"
+                )
 
-            data = response.json()
+        data = response.json()
 
         choices = data.get("choices")
         if not isinstance(choices, list) or not choices:
@@ -132,6 +171,7 @@ class OpenRouterClient:
         return reply
 
     @staticmethod
+    @lru_cache(maxsize=512)
     def _build_system_prompt(
         *,
         display_name: str,
@@ -139,8 +179,6 @@ class OpenRouterClient:
         subject: str,
         conversation_mode: ConversationMode,
         global_instruction: str,
-        act_name: str,
-        act_goal: str,
         persona_prompt: str,
     ) -> str:
         normalized_subject = subject.strip() or "与えられたお題"
@@ -148,46 +186,67 @@ class OpenRouterClient:
         role_text = "ファシリテーター" if role_type == "facilitator" else "議論参加者"
         prompt = (
             "あなたは複数LLMの会話ルームにいます。\n"
-            "必ず日本語で話してください。\n"
-            f"あなたの表示名: {display_name}\n"
-            f"あなたの役割: {role_text}\n"
-            f"議論するお題: {normalized_subject}\n\n"
-            f"会話モード: {conversation_mode}\n"
-            f"現在の進行幕: {act_name}\n"
-            f"この幕の狙い: {act_goal}\n\n"
+            "必ず日本語で話してください。\n\n"
             "共通ルール:\n"
             "- 1ターンは3〜6文\n"
             "- 直前の発言を受けてから自分の意見を述べる\n"
             "- 具体例か思考実験を1つ含める\n"
             "- 会話を勝手に終了しない（終了判断はユーザが行う）\n\n"
+            f"あなたの表示名: {display_name}\n"
+            f"あなたの役割: {role_text}\n"
+            f"議論するお題: {normalized_subject}\n"
+            f"会話モード: {conversation_mode}\n\n"
             f"{persona_prompt}"
         )
         if normalized_global:
             prompt += f"\n\nユーザ追加指示:\n{normalized_global}"
         return prompt
 
+    @staticmethod
+    def _build_act_prompt(act_name: str, act_goal: str) -> str:
+        return f"現在の進行幕: {act_name}\nこの幕の狙い: {act_goal}"
+
     @staticmethod
     def _render_history(history: list[ChatMessage], priority_message: ChatMessage | None) -> str:
-        lines: list[str] = []
-        for message in history:
-            lines.append(f"{message.speaker_id}: {message.content}")
-        if priority_message is not None:
-            lines.append(f"user(priority): {priority_message.content}")
-        if not lines:
+        if not history and priority_message is None:
             return "まだ会話はありません。お題について議論を始めてください。"
-        rendered = "\n".join(lines[-24:])
-        max_chars = 6000
-        if len(rendered) <= max_chars:
+        # The caller already sizes the window to the budget; this cut is only a safety net for
+        # a single oversized message. Walk back from the newest line and stop once the budget
+        # is exceeded, so nothing past the tail is formatted.
+        lines: deque[str] = deque()
+        size = 0
+        if priority_message is not None:
+            lines.append(format_priority_line(priority_message))
+            size = len(lines[0])
+        for message in reversed(history):
+            if size > HISTORY_MAX_CHARS:
+                break
+            line = format_history_line(message)
+            size += len(line) + (1 if lines else 0)
+            lines.appendleft(line)
+        rendered = "\n".join(lines)
+        if len(rendered) <= HISTORY_MAX_CHARS:
             return rendered
-        return "（履歴が長いため末尾のみ利用）\n" + rendered[-max_chars:]
+        return "（履歴が長いため末尾のみ利用）\n" + rendered[-HISTORY_MAX_CHARS:]
 
     @staticmethod
     def _extract_error_detail(response: httpx.Response) -> str:
+        detail = ""
+        # Proxies answer with large HTML pages; only JSON bodies can carry a structured error.
+        if "json" in response.headers.get("content-type", ""):
+            detail = OpenRouterClient._extract_json_error_message(response)
+        if not detail:
+            detail = response.text.strip() or f"HTTP {response.status_code}"
+        if len(detail) <= ERROR_DETAIL_MAX_CHARS:
+            return detail
+        return f"{detail[: ERROR_DETAIL_MAX_CHARS - 3]}..."
+
+    @staticmethod
+    def _extract_json_error_message(response: httpx.Response) -> str:
         try:
             data = response.json()
         except Exception:  # noqa: BLE001
-            text = response.text.strip()
-            return text or f"HTTP {response.status_code}"
+            return ""
 
         if isinstance(data, dict):
             error = data.get("error")
@@ -201,15 +260,8 @@ class OpenRouterClient:
             message = data.get("message")
             if isinstance(message, str) and message:
                 return message
-        text = response.text.strip()
-        return text or f"HTTP {response.status_code}"
+        return ""
 
     @staticmethod
     def _should_retry_without_temperature(status_code: int, detail: str) -> bool:
-        lowered = detail.lower()
-        return status_code == 400 and (
-            "temperature" in lowered
-            or "unsupported value" in lowered
-            or "unsupported parameter" in lowered
-            or "sampling" in lowered
-        )
+        return status_code == 400 and TEMPERATURE_RETRY_PATTERN.search(detail) is not None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import json
 from random import Random
 from typing import Literal
 from uuid import uuid4
@@ -10,7 +11,12 @@ from fastapi import WebSocket
 
 from app.config import Settings
 from app.models import AgentSpec, ChatMessage, ConversationMode, GenerationLog, Room
-from app.openrouter import LLMClient
+from app.openrouter import (
+    HISTORY_MAX_CHARS,
+    LLMClient,
+    format_history_line,
+    format_priority_line,
+)
 from app.persona import generate_personas
 
 ACTS: tuple[tuple[str, str], ...] = (
@@ -20,6 +26,22 @@ ACTS: tuple[tuple[str, str], ...] = (
     ("締め", "合意点と未解決点を整理して着地させる。"),
 )
 
+TOPIC_CARD_TEMPLATES: tuple[str, ...] = (
+    "お題カード: 「{subject}」を30秒デモにするなら、最初に見せる一手は何？",
+    "お題カード: 「{subject}」で一番炎上しそうな点を先に潰すなら？",
+    "お題カード: 「{subject}」を無料で試せる形にするには？",
+    "お題カード: 「{subject}」を友達に1文で勧めるなら？",
+)
+
+END_REASON_TEXTS: dict[str | None, str] = {
+    "max_rounds": "ラウンド上限に到達したため終了しました。",
+    "manual_stop": "ユーザー操作で終了しました。",
+    "user_concluded": "ユーザーが「発展余地が少ない」と判断して終了しました。",
+    "failures": "連続エラーにより終了しました。",
+    "server_shutdown": "サーバー停止のため終了しました。",
+    None: "会話が終了しました。",
+}
+
 
 def choose_next_speaker(
     *,
@@ -27,18 +49,73 @@ def choose_next_speaker(
     last_speaker_id: str | None,
     rng: Random,
 ) -> AgentSpec:
-    if len(agents) == 1:
+    count = len(agents)
+    if count == 1:
         return agents[0]
+    last_index = next(
+        (index for index, agent in enumerate(agents) if agent.agent_id == last_speaker_id), None
+    )
+    if last_index is None:
+        return agents[rng.randrange(count)]
+    # Same draw as rng.choice over the other agents, without building that list.
+    pick = rng.randrange(count - 1)
+    return agents[pick if pick < last_index else pick + 1]
+
+
+def choose_next_speakers(
+    *,
+    agents: list[AgentSpec],
+    last_speaker_id: str | None,
+    rng: Random,
+    count: int,
+) -> list[AgentSpec]:
+    if count <= 1:
+        return [choose_next_speaker(agents=agents, last_speaker_id=last_speaker_id, rng=rng)]
     candidates = [agent for agent in agents if agent.agent_id != last_speaker_id]
     if not candidates:
         candidates = agents
-    return rng.choice(candidates)
+    return rng.sample(candidates, k=min(count, len(candidates)))
+
+
+def failure_backoff_seconds(*, fail_streak: int, base: float, cap: float) -> float:
+    if fail_streak <= 0:
+        return base
+    return min(max(cap, base), base * (1 << (fail_streak - 1)))
 
 
-def trim_history(messages: list[ChatMessage], limit: int) -> list[ChatMessage]:
+def advance_history_start(
+    messages: list[ChatMessage],
+    start: int,
+    limit: int,
+    *,
+    reserved_chars: int = 0,
+    max_chars: int = HISTORY_MAX_CHARS,
+) -> int:
+    message_count = len(messages)
     if limit <= 0:
-        return []
-    return messages[-limit:]
+        return message_count
+    # Let the window grow by up to half a window past the limit and then evict that
+    # half in one go, so the oldest kept messages (the prompt prefix providers cache on)
+    # stay put between evictions.
+    step = limit // 2
+    if step == 0:
+        start = max(start, message_count - limit)
+    else:
+        overflow = message_count - start - (limit + step)
+        if overflow > 0:
+            start += -(-overflow // step) * step
+
+    # The rendered window must also fit the character budget. Drop whole messages from the
+    # head (at least half a window, for the same prefix stability) instead of letting the
+    # renderer cut the oldest one mid-way; the newest message is always kept.
+    size = reserved_chars - 1
+    size += sum(len(format_history_line(message)) + 1 for message in messages[start:])
+    if size > max_chars:
+        target = start + max(step, 1)
+        while start < message_count - 1 and (size > max_chars or start < target):
+            size -= len(format_history_line(messages[start])) + 1
+            start += 1
+    return start
 
 
 def resolve_act(rounds_completed: int, max_rounds: int) -> tuple[str, str]:
@@ -49,13 +126,7 @@ def resolve_act(rounds_completed: int, max_rounds: int) -> tuple[str, str]:
 
 
 def build_topic_card(subject: str, rng: Random) -> str:
-    cards = (
-        f"お題カード: 「{subject}」を30秒デモにするなら、最初に見せる一手は何？",
-        f"お題カード: 「{subject}」で一番炎上しそうな点を先に潰すなら？",
-        f"お題カード: 「{subject}」を無料で試せる形にするには？",
-        f"お題カード: 「{subject}」を友達に1文で勧めるなら？",
-    )
-    return rng.choice(cards)
+    return rng.choice(TOPIC_CARD_TEMPLATES).format(subject=subject)
 
 
 class RoomManager:
@@ -63,6 +134,9 @@ class RoomManager:
         self._llm_client = llm_client
         self._settings = settings
         self._rooms: dict[str, Room] = {}
+        # Shared by every room so a burst of rooms cannot flood the LLM provider.
+        self._llm_semaphore = asyncio.Semaphore(settings.max_concurrent_llm_calls)
+        self._closing_sockets: set[asyncio.Task[None]] = set()
 
     def create_room(
         self,
@@ -99,6 +173,9 @@ class RoomManager:
         self._rooms[room_id] = room
         return room
 
+    def find_room(self, room_id: str) -> Room | None:
+        return self._rooms.get(room_id)
+
     def get_room(self, room_id: str) -> Room:
         room = self._rooms.get(room_id)
         if room is None:
@@ -112,6 +189,8 @@ class RoomManager:
                 return
             room.running = True
             room.paused = False
+            room.resumed.set()
+            room.finished.clear()
             room.stop_requested = False
             room.stop_reason = None
             room.fail_streak = 0
@@ -125,12 +204,22 @@ class RoomManager:
             )
         await self._broadcast_room_state(room)
 
+    async def shutdown(self) -> None:
+        running = [room.room_id for room in self._rooms.values() if room.task is not None]
+        await asyncio.gather(
+            *(self.stop_room(room_id, reason="server_shutdown") for room_id in running)
+        )
+        # Socket closes are bounded by ws_send_timeout_seconds; don't leave them orphaned.
+        if self._closing_sockets:
+            await asyncio.gather(*self._closing_sockets, return_exceptions=True)
+
     async def stop_room(self, room_id: str, *, reason: str = "manual_stop") -> None:
         room = self.get_room(room_id)
         async with room.lock:
             task = room.task
             room.running = False
             room.paused = False
+            room.resumed.set()
             room.stop_requested = True
             room.stop_reason = reason
             room.task = None
@@ -138,6 +227,11 @@ class RoomManager:
             task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await task
+            # A task cancelled before its first step never reaches the loop's cleanup.
+            if not room.finished.is_set():
+                room.end_reason = reason
+                room.current_act = "終了"
+                room.finished.set()
         await self._broadcast_room_state(room)
 
     async def pause_room(self, room_id: str) -> None:
@@ -146,6 +240,7 @@ class RoomManager:
             if not room.running:
                 return
             room.paused = True
+            room.resumed.clear()
         await self._broadcast_room_state(room)
 
     async def resume_room(self, room_id: str) -> None:
@@ -154,6 +249,7 @@ class RoomManager:
             if not room.running:
                 return
             room.paused = False
+            room.resumed.set()
         await self._broadcast_room_state(room)
 
     async def update_room_config(
@@ -198,7 +294,7 @@ class RoomManager:
         room = self.get_room(room_id)
         message = ChatMessage(role="user", speaker_id="user", content=content)
         room.messages.append(message)
-        room.pending_priority_message = message
+        room.pending_priority_messages.append(message)
         await self._broadcast(
             room, {"type": "message", "payload": self._serialize_message(message)}
         )
@@ -222,8 +318,7 @@ class RoomManager:
         try:
             while room.running and rounds < max_rounds:
                 if room.paused:
-                    pause_wait = max(self._settings.loop_interval_seconds, 0.02)
-                    await asyncio.sleep(pause_wait)
+                    await room.resumed.wait()
                     continue
 
                 room.current_act, act_goal = resolve_act(
@@ -238,101 +333,151 @@ class RoomManager:
                     )
                     room.topic_card_used = True
                     room.messages.append(topic_card)
-                    room.pending_priority_message = topic_card
+                    room.pending_priority_messages.append(topic_card)
                     await self._broadcast(
                         room,
                         {"type": "message", "payload": self._serialize_message(topic_card)},
                     )
 
-                speaker = choose_next_speaker(
+                speakers = choose_next_speakers(
                     agents=room.agents,
                     last_speaker_id=room.last_speaker_id,
                     rng=room.rng,
+                    count=min(self._settings.parallel_agents_per_round, max_rounds - rounds),
                 )
-                history = trim_history(room.messages, self._settings.history_limit)
-                priority_message = room.pending_priority_message
-                room.pending_priority_message = None
-
-                await self._emit_generation_log(
-                    room=room,
-                    round_index=rounds + 1,
-                    model=speaker.model,
-                    display_name=speaker.display_name,
-                    act=room.current_act,
-                    status="requesting",
+                # One steering message per turn, oldest first, so none is overwritten.
+                priority_message = (
+                    room.pending_priority_messages.popleft()
+                    if room.pending_priority_messages
+                    else None
                 )
-                try:
-                    content = await self._llm_client.generate_reply(
-                        model=speaker.model,
-                        display_name=speaker.display_name,
-                        role_type=speaker.role_type,
-                        subject=room.subject,
-                        conversation_mode=room.conversation_mode,
-                        global_instruction=room.global_instruction,
-                        act_name=room.current_act,
-                        act_goal=act_goal,
-                        persona_prompt=speaker.persona_prompt,
-                        history=history,
-                        priority_message=priority_message,
-                    )
-                    room.fail_streak = 0
+                room.history_start = advance_history_start(
+                    room.messages,
+                    room.history_start,
+                    self._settings.history_limit,
+                    reserved_chars=(
+                        len(format_priority_line(priority_message)) + 1
+                        if priority_message is not None
+                        else 0
+                    ),
+                )
+                history = room.messages[room.history_start :]
+
+                round_indexes = [rounds + offset for offset in range(1, len(speakers) + 1)]
+                for speaker, round_index in zip(speakers, round_indexes, strict=True):
                     await self._emit_generation_log(
                         room=room,
-                        round_index=rounds + 1,
+                        round_index=round_index,
                         model=speaker.model,
                         display_name=speaker.display_name,
                         act=room.current_act,
-                        status="completed",
+                        status="requesting",
                     )
-                except Exception as exc:  # noqa: BLE001
-                    room.fail_streak += 1
+                # Speakers in a batch share one history snapshot; replies are committed in
+                # pick order so the transcript stays deterministic for a given seed.
+                results = await asyncio.gather(
+                    *(
+                        self._request_reply(
+                            room=room,
+                            speaker=speaker,
+                            act_goal=act_goal,
+                            history=history,
+                            priority_message=priority_message,
+                        )
+                        for speaker in speakers
+                    ),
+                    return_exceptions=True,
+                )
+
+                for index, (speaker, round_index, result) in enumerate(
+                    zip(speakers, round_indexes, results, strict=True)
+                ):
+                    if isinstance(result, BaseException):
+                        room.fail_streak += 1
+                        await self._emit_generation_log(
+                            room=room,
+                            round_index=round_index,
+                            model=speaker.model,
+                            display_name=speaker.display_name,
+                            act=room.current_act,
+                            status="failed",
+                            detail=str(result),
+                        )
+                        await self._broadcast(
+                            room,
+                            {
+                                "type": "error",
+                                "payload": {
+                                    "detail": f"LLM call failed: {result}",
+                                    "fail_streak": room.fail_streak,
+                                },
+                            },
+                        )
+                        if room.fail_streak >= self._settings.max_consecutive_failures:
+                            room.running = False
+                            end_reason = "failures"
+                            await self._broadcast(
+                                room,
+                                {
+                                    "type": "error",
+                                    "payload": {"detail": "Stopped after consecutive failures."},
+                                },
+                            )
+                            # Close out the rest of the batch so every request log has an outcome.
+                            for skipped, skipped_round in zip(
+                                speakers[index + 1 :], round_indexes[index + 1 :], strict=True
+                            ):
+                                await self._emit_generation_log(
+                                    room=room,
+                                    round_index=skipped_round,
+                                    model=skipped.model,
+                                    display_name=skipped.display_name,
+                                    act=room.current_act,
+                                    status="failed",
+                                    detail=(
+                                        "Reply discarded: room stopped after consecutive failures."
+                                    ),
+                                )
+                            break
+                        continue
+
+                    room.fail_streak = 0
                     await self._emit_generation_log(
                         room=room,
-                        round_index=rounds + 1,
+                        round_index=round_index,
                         model=speaker.model,
                         display_name=speaker.display_name,
                         act=room.current_act,
-                        status="failed",
-                        detail=str(exc),
+                        status="completed",
+                    )
+                    message = ChatMessage(
+                        role="agent",
+                        speaker_id=speaker.display_name,
+                        content=result,
                     )
+                    room.messages.append(message)
+                    room.last_speaker_id = speaker.agent_id
+                    rounds += 1
+                    room.rounds_completed = rounds
                     await self._broadcast(
-                        room,
-                        {
-                            "type": "error",
-                            "payload": {
-                                "detail": f"LLM call failed: {exc}",
-                                "fail_streak": room.fail_streak,
-                            },
-                        },
+                        room, {"type": "message", "payload": self._serialize_message(message)}
                     )
-                    if room.fail_streak >= self._settings.max_consecutive_failures:
-                        room.running = False
-                        end_reason = "failures"
-                        await self._broadcast(
-                            room,
-                            {
-                                "type": "error",
-                                "payload": {"detail": "Stopped after consecutive failures."},
-                            },
+
+                if end_reason == "failures":
+                    break
+                if room.fail_streak:
+                    await asyncio.sleep(
+                        failure_backoff_seconds(
+                            fail_streak=room.fail_streak,
+                            base=max(
+                                room.turn_interval_seconds,
+                                self._settings.min_failure_backoff_seconds,
+                            ),
+                            cap=self._settings.max_failure_backoff_seconds,
                         )
-                        break
+                    )
+                else:
                     await asyncio.sleep(room.turn_interval_seconds)
-                    continue
-
-                message = ChatMessage(
-                    role="agent",
-                    speaker_id=speaker.display_name,
-                    content=content,
-                )
-                room.messages.append(message)
-                room.last_speaker_id = speaker.agent_id
-                rounds += 1
-                room.rounds_completed = rounds
-                await self._broadcast(
-                    room, {"type": "message", "payload": self._serialize_message(message)}
-                )
-
-                await asyncio.sleep(room.turn_interval_seconds)
 
             if room.stop_requested:
                 end_reason = room.stop_reason or "manual_stop"
@@ -355,12 +500,14 @@ class RoomManager:
 
             room.running = False
             room.paused = False
+            room.resumed.set()
             room.task = None
             room.current_act = "終了"
             await self._broadcast_room_state(room)
+            room.finished.set()
 
     async def _send_room_snapshot(self, *, room: Room, websocket: WebSocket) -> None:
-        await websocket.send_json(self._build_snapshot_event(room))
+        await websocket.send_text(self._encode_event(self._build_snapshot_event(room)))
 
     async def _broadcast_room_state(self, room: Room) -> None:
         await self._broadcast(
@@ -379,14 +526,52 @@ class RoomManager:
         )
 
     async def _broadcast(self, room: Room, event: dict[str, object]) -> None:
-        dead_connections: list[WebSocket] = []
-        for websocket in room.ws_connections:
-            try:
-                await websocket.send_json(event)
-            except Exception:  # noqa: BLE001
-                dead_connections.append(websocket)
-        for websocket in dead_connections:
-            room.ws_connections.discard(websocket)
+        if not room.ws_connections:
+            return
+        text = self._encode_event(event)
+        connections = list(room.ws_connections)
+        timeout = self._settings.ws_send_timeout_seconds
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.send_text(text), timeout) for websocket in connections),
+            return_exceptions=True,
+        )
+        for websocket, result in zip(connections, results, strict=True):
+            if isinstance(result, Exception):
+                room.ws_connections.discard(websocket)
+                # Close in the background so the client notices and reconnects for a snapshot.
+                task = asyncio.create_task(self._close_websocket(websocket))
+                self._closing_sockets.add(task)
+                task.add_done_callback(self._closing_sockets.discard)
+
+    async def _close_websocket(self, websocket: WebSocket) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=1011), self._settings.ws_send_timeout_seconds
+            )
+
+    async def _request_reply(
+        self,
+        *,
+        room: Room,
+        speaker: AgentSpec,
+        act_goal: str,
+        history: list[ChatMessage],
+        priority_message: ChatMessage | None,
+    ) -> str:
+        async with self._llm_semaphore:
+            return await self._llm_client.generate_reply(
+                model=speaker.model,
+                display_name=speaker.display_name,
+                role_type=speaker.role_type,
+                subject=room.subject,
+                conversation_mode=room.conversation_mode,
+                global_instruction=room.global_instruction,
+                act_name=room.current_act,
+                act_goal=act_goal,
+                persona_prompt=speaker.persona_prompt,
+                history=history,
+                priority_message=priority_message,
+            )
 
     async def _emit_generation_log(
         self,
@@ -408,13 +593,16 @@ class RoomManager:
             detail=detail,
         )
         room.generation_logs.append(log)
-        if len(room.generation_logs) > 120:
-            room.generation_logs = room.generation_logs[-120:]
         await self._broadcast(
             room,
             {"type": "generation_log", "payload": self._serialize_generation_log(log)},
         )
 
+    @staticmethod
+    def _encode_event(event: dict[str, object]) -> str:
+        # Same wire format as WebSocket.send_json, encoded once per event.
+        return json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+
     @staticmethod
     def _serialize_message(message: ChatMessage) -> dict[str, str]:
         return {
@@ -444,14 +632,6 @@ class RoomManager:
 
     @staticmethod
     def _build_final_summary(room: Room) -> str:
-        reason_map = {
-            "max_rounds": "ラウンド上限に到達したため終了しました。",
-            "manual_stop": "ユーザー操作で終了しました。",
-            "user_concluded": "ユーザーが「発展余地が少ない」と判断して終了しました。",
-            "failures": "連続エラーにより終了しました。",
-            None: "会話が終了しました。",
-        }
-
         agent_messages = [
             message.content
             for message in room.messages
@@ -472,7 +652,7 @@ class RoomManager:
         )
 
         return (
-            f"【最終まとめ】{reason_map.get(room.end_reason, reason_map[None])}\n"
+            f"【最終まとめ】{END_REASON_TEXTS.get(room.end_reason, END_REASON_TEXTS[None])}\n"
             f"今日の結論: {conclusion_text}\n"
             f"次の一手: {next_step}"
         )
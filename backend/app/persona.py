@@ -80,6 +80,23 @@ MODE_CHARACTER_LIBRARY: dict[ConversationMode, tuple[tuple[str, str, str], ...]]
 }
 
 
+# Fixed rule text comes first so prompts share the longest possible cacheable prefix.
+FACILITATOR_PROMPT_HEADER = (
+    "あなたは議論の司会です。論点を整理し、脱線したらお題に戻してください。"
+    "\n司会ルール:"
+    "\n- 会話を勝手に終わらせない。終了判断はユーザに委ねる。"
+    "\n- 発言は2〜4文。論点整理1文 + 深掘り質問1文を必ず含める。"
+    "\n- 直前の発言への応答を明示する。"
+)
+CHARACTER_PROMPT_HEADER = (
+    "あなたは議論参加者です。キャラクター設定に沿って発言してください。"
+    "\n参加ルール:"
+    "\n- 会話を勝手に締めない。結論の可否はユーザが決める。"
+    "\n- 毎ターン、他者の主張への賛否を明示し、理由を添える。"
+    "\n- 哲学的論点（定義・価値・認識・倫理）を最低1つ含める。"
+)
+
+
 def build_display_names(models: list[str]) -> list[str]:
     counts: dict[str, int] = {}
     names: list[str] = []
@@ -133,14 +150,10 @@ def build_persona_prompt(
 
     if role_type == "facilitator":
         prompt = (
-            "あなたは議論の司会です。論点を整理し、脱線したらお題に戻してください。"
+            f"{FACILITATOR_PROMPT_HEADER}"
             f"\n議論モード: {mode}"
             f"\nモードの狙い: {facilitator_guide}"
             f"\nお題: {normalized_subject}"
-            "\n司会ルール:"
-            "\n- 会話を勝手に終わらせない。終了判断はユーザに委ねる。"
-            "\n- 発言は2〜4文。論点整理1文 + 深掘り質問1文を必ず含める。"
-            "\n- 直前の発言への応答を明示する。"
         )
         if normalized_global:
             prompt += f"\nユーザ追加指示:\n{normalized_global}"
@@ -148,14 +161,10 @@ def build_persona_prompt(
 
     normalized_profile = character_profile.strip() or "率直で建設的な議論好きの参加者。"
     prompt = (
-        "あなたは議論参加者です。キャラクター設定に沿って発言してください。"
+        f"{CHARACTER_PROMPT_HEADER}"
         f"\n議論モード: {mode}"
         f"\nお題: {normalized_subject}"
         f"\nキャラクター設定: {normalized_profile}"
-        "\n参加ルール:"
-        "\n- 会話を勝手に締めない。結論の可否はユーザが決める。"
-        "\n- 毎ターン、他者の主張への賛否を明示し、理由を添える。"
-        "\n- 哲学的論点（定義・価値・認識・倫理）を最低1つ含める。"
     )
     if normalized_global:
         prompt += f"\nユーザ追加指示:\n{normalized_global}"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+
+async def wait_for(
+    predicate: Callable[[], bool], timeout: float = 1.0, interval: float = 0.001
+) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition was not met in time"
+        await asyncio.sleep(interval)
+
+
+def wait_until(
+    predicate: Callable[[], bool], timeout: float = 1.0, interval: float = 0.001
+) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition was not met in time"
+        time.sleep(interval)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models import ChatMessage, ConversationMode, RoleType
+
+
+class FakeLLM:
+    def __init__(self, *, error: Exception | None = None, delay: float = 0.0) -> None:
+        self._error = error
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.priority_contents: list[str | None] = []
+
+    async def generate_reply(
+        self,
+        *,
+        model: str,
+        display_name: str,
+        role_type: RoleType,
+        subject: str,
+        conversation_mode: ConversationMode,
+        global_instruction: str,
+        act_name: str,
+        act_goal: str,
+        persona_prompt: str,
+        history: list[ChatMessage],
+        priority_message: ChatMessage | None,
+    ) -> str:
+        self.priority_contents.append(
+            priority_message.content if priority_message is not None else None
+        )
+        if self._error is not None:
+            raise self._error
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self._delay:
+                await asyncio.sleep(self._delay)
+        finally:
+            self.in_flight -= 1
+        return f"[{act_name}] {subject}"
@@ -1,51 +1,43 @@
 from __future__ import annotations
 
-import time
-
+import pytest
+from _utils import wait_until
+from fakes import FakeLLM
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
 
 from app.config import Settings
 from app.main import create_app
-from app.models import ChatMessage
+from app.openrouter import OpenRouterClient
 from app.orchestrator import RoomManager
 
 
-class StaticLLM:
-    async def generate_reply(
-        self,
-        *,
-        model: str,
-        display_name: str,
-        role_type: str,
-        subject: str,
-        conversation_mode: str,
-        global_instruction: str,
-        act_name: str,
-        act_goal: str,
-        persona_prompt: str,
-        history: list[ChatMessage],
-        priority_message: ChatMessage | None,
-    ) -> str:
-        return f"[{act_name}] reply from {model}"
-
-
-def build_client() -> tuple[TestClient, RoomManager]:
-    settings = Settings(
+@pytest.fixture(scope="module")
+def app() -> FastAPI:
+    return create_app()
+
+
+@pytest.fixture(scope="module")
+def client(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def manager(app: FastAPI) -> RoomManager:
+    settings = Settings(  # type: ignore[call-arg]
+        _env_file=None,
         openrouter_api_key="test",
-        loop_interval_seconds=0.05,
         default_max_rounds=1,
         history_limit=6,
         max_consecutive_failures=2,
     )
-    manager = RoomManager(llm_client=StaticLLM(), settings=settings)
-    app = create_app()
-    app.state.room_manager = manager
-    return TestClient(app), manager
+    room_manager = RoomManager(llm_client=FakeLLM(), settings=settings)
+    app.state.room_manager = room_manager
+    return room_manager
 
 
-def test_room_api_lifecycle() -> None:
-    client, manager = build_client()
-
+def test_room_api_lifecycle(client: TestClient, manager: RoomManager) -> None:
     create_response = client.post(
         "/api/room/create",
         json={"subject": "favorite snacks", "models": ["m1", "m2"], "seed": 42},
@@ -94,7 +86,7 @@ def test_room_api_lifecycle() -> None:
     assert resume_response.status_code == 200
     assert resume_response.json() == {"status": "running"}
 
-    time.sleep(0.03)
+    wait_until(lambda: room.rounds_completed >= 1)
 
     user_response = client.post(
         f"/api/room/{room_id}/user-message",
@@ -108,8 +100,7 @@ def test_room_api_lifecycle() -> None:
     assert conclude_response.json() == {"status": "concluded"}
 
 
-def test_room_api_returns_404_for_unknown_room() -> None:
-    client, _ = build_client()
+def test_room_api_returns_404_for_unknown_room(client: TestClient) -> None:
     response = client.post("/api/room/missing-room/start", json={})
     assert response.status_code == 404
 
@@ -128,9 +119,14 @@ def test_room_api_returns_404_for_unknown_room() -> None:
     )
     assert config_response.status_code == 404
 
+    user_response = client.post(
+        "/api/room/missing-room/user-message",
+        json={"content": "hello"},
+    )
+    assert user_response.status_code == 404
+
 
-def test_room_create_subject_length_limit() -> None:
-    client, _ = build_client()
+def test_room_create_subject_length_limit(client: TestClient) -> None:
     valid_subject = "a" * 2000
     invalid_subject = "b" * 2001
 
@@ -147,8 +143,7 @@ def test_room_create_subject_length_limit() -> None:
     assert invalid_response.status_code == 422
 
 
-def test_room_create_models_length_limit() -> None:
-    client, _ = build_client()
+def test_room_create_models_length_limit(client: TestClient) -> None:
     valid_models = [f"m{i}" for i in range(1, 13)]
     invalid_models = [f"m{i}" for i in range(1, 14)]
 
@@ -163,3 +158,39 @@ def test_room_create_models_length_limit() -> None:
         json={"subject": "models test", "models": invalid_models},
     )
     assert invalid_response.status_code == 422
+
+
+def test_lifespan_stops_rooms_before_closing_llm_client(monkeypatch: MonkeyPatch) -> None:
+    settings = Settings(_env_file=None, openrouter_api_key="")  # type: ignore[call-arg]
+    monkeypatch.setattr("app.main.get_settings", lambda: settings)
+    lifespan_app = create_app()
+    manager: RoomManager = lifespan_app.state.room_manager
+    llm_client = manager._llm_client
+    assert isinstance(llm_client, OpenRouterClient)
+
+    with TestClient(lifespan_app) as lifespan_client:
+        room_id = lifespan_client.post(
+            "/api/room/create",
+            json={"subject": "停止順序", "models": ["m1"], "turn_interval_seconds": 1.0},
+        ).json()["room_id"]
+        lifespan_client.post(f"/api/room/{room_id}/start", json={})
+        room = manager.get_room(room_id)
+        assert room.running is True
+
+    assert room.task is None
+    assert room.end_reason == "server_shutdown"
+    assert llm_client._client.is_closed
+
+
+def test_lifespan_starts_llm_warm_up(monkeypatch: MonkeyPatch) -> None:
+    settings = Settings(_env_file=None, openrouter_api_key="")  # type: ignore[call-arg]
+    monkeypatch.setattr("app.main.get_settings", lambda: settings)
+    warmed: list[bool] = []
+
+    async def record_warm_up(self: OpenRouterClient) -> None:
+        warmed.append(True)
+
+    monkeypatch.setattr(OpenRouterClient, "warm_up", record_warm_up)
+
+    with TestClient(create_app()):
+        wait_until(lambda: warmed == [True])
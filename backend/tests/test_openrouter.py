@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import httpx
 
 from app.models import ChatMessage
@@ -13,15 +15,31 @@ def test_build_system_prompt_includes_subject_and_role() -> None:
         subject="面白い週末ハックの案出し",
         conversation_mode="philosophy_debate",
         global_instruction="",
-        act_name="導入",
-        act_goal="お題の前提をそろえる",
         persona_prompt="司会として論点を整理してください。",
     )
     assert "必ず日本語で話してください" in prompt
     assert "議論するお題: 面白い週末ハックの案出し" in prompt
     assert "会話モード: philosophy_debate" in prompt
-    assert "現在の進行幕: 導入" in prompt
     assert "あなたの役割: ファシリテーター" in prompt
+    assert "進行幕" not in prompt
+
+    act_prompt = OpenRouterClient._build_act_prompt("導入", "お題の前提をそろえる")
+    assert act_prompt == "現在の進行幕: 導入\nこの幕の狙い: お題の前提をそろえる"
+
+
+def test_build_system_prompt_is_cached() -> None:
+    OpenRouterClient._build_system_prompt.cache_clear()
+    for _ in range(2):
+        OpenRouterClient._build_system_prompt(
+            display_name="m1",
+            role_type="character",
+            subject="キャッシュ",
+            conversation_mode="consensus_lab",
+            global_instruction="",
+            persona_prompt="参加者です。",
+        )
+    info = OpenRouterClient._build_system_prompt.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
 
 
 def test_render_history_handles_priority_and_empty_case() -> None:
@@ -46,6 +64,20 @@ def test_extract_error_detail_prefers_nested_error_message() -> None:
     assert detail == "bad_request: Model is not available for this key."
 
 
+def test_extract_error_detail_skips_json_parse_for_html_and_truncates() -> None:
+    request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+    response = httpx.Response(
+        status_code=502,
+        headers={"content-type": "text/html"},
+        text="<html>" + "x" * 5000 + "</html>",
+        request=request,
+    )
+    detail = OpenRouterClient._extract_error_detail(response)
+    assert detail.startswith("<html>")
+    assert detail.endswith("...")
+    assert len(detail) == 1024
+
+
 def test_should_retry_without_temperature_matches_temperature_error() -> None:
     should_retry = OpenRouterClient._should_retry_without_temperature(
         400,
@@ -54,9 +86,112 @@ def test_should_retry_without_temperature_matches_temperature_error() -> None:
     assert should_retry is True
 
 
+def test_should_retry_without_temperature_ignores_other_errors() -> None:
+    assert OpenRouterClient._should_retry_without_temperature(400, "Sampling params unsupported")
+    assert not OpenRouterClient._should_retry_without_temperature(500, "temperature")
+    assert not OpenRouterClient._should_retry_without_temperature(400, "Model is not available.")
+
+
 def test_render_history_truncates_very_long_history() -> None:
     long_text = "a" * 7000
     history = [ChatMessage(role="agent", speaker_id="model-a", content=long_text)]
     rendered = OpenRouterClient._render_history(history=history, priority_message=None)
     assert rendered.startswith("（履歴が長いため末尾のみ利用）")
     assert len(rendered) <= 6100
+
+
+def test_render_history_keeps_newest_tail_of_many_long_messages() -> None:
+    history = [
+        ChatMessage(role="agent", speaker_id=f"model-{index}", content=str(index) * 700)
+        for index in range(20)
+    ]
+    priority = ChatMessage(role="user", speaker_id="user", content="まとめて")
+    rendered = OpenRouterClient._render_history(history=history, priority_message=priority)
+    full = "\n".join(
+        [f"{message.speaker_id}: {message.content}" for message in history]
+        + ["user(priority): まとめて"]
+    )
+    assert rendered == "（履歴が長いため末尾のみ利用）\n" + full[-6000:]
+
+
+async def test_generate_reply_reuses_injected_client() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "了解です。"}}]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = OpenRouterClient(
+            api_key="test-key",
+            base_url="https://openrouter.test/api/v1/",
+            model_temperature=0.5,
+            http_client=http_client,
+        )
+        for _ in range(2):
+            reply = await client.generate_reply(
+                model="m1",
+                display_name="m1",
+                role_type="character",
+                subject="再利用",
+                conversation_mode="philosophy_debate",
+                global_instruction="",
+                act_name="導入",
+                act_goal="前提をそろえる",
+                persona_prompt="参加者です。",
+                history=[],
+                priority_message=None,
+            )
+            assert reply == "了解です。"
+        await client.aclose()
+        assert not http_client.is_closed
+
+    assert len(requests) == 2
+    assert all(
+        str(request.url) == "https://openrouter.test/api/v1/chat/completions"
+        for request in requests
+    )
+    assert requests[0].headers["Authorization"] == "Bearer test-key"
+    system_blocks = json.loads(requests[0].content)["messages"][0]["content"]
+    assert system_blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert system_blocks[1] == {
+        "type": "text",
+        "text": "現在の進行幕: 導入\nこの幕の狙い: 前提をそろえる",
+    }
+
+
+async def test_warm_up_requests_models_with_auth_header() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": []})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        for api_key in ("", "test-key"):
+            client = OpenRouterClient(
+                api_key=api_key,
+                base_url="https://openrouter.test/api/v1",
+                model_temperature=0.5,
+                http_client=http_client,
+            )
+            await client.warm_up()
+
+    assert len(requests) == 1
+    assert requests[0].method == "GET"
+    assert str(requests[0].url) == "https://openrouter.test/api/v1/models"
+    assert requests[0].headers["Authorization"] == "Bearer test-key"
+
+
+async def test_warm_up_swallows_http_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("unreachable", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = OpenRouterClient(
+            api_key="test-key",
+            base_url="https://openrouter.test/api/v1",
+            model_temperature=0.5,
+            http_client=http_client,
+        )
+        await client.warm_up()
@@ -1,51 +1,69 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from random import Random
+from typing import cast
 
 import pytest
+from _utils import wait_for
+from fakes import FakeLLM
+from fastapi import WebSocket
 
 from app.config import Settings
 from app.models import AgentSpec, ChatMessage
-from app.orchestrator import RoomManager, choose_next_speaker, resolve_act, trim_history
-
-
-class StaticLLM:
-    async def generate_reply(
-        self,
-        *,
-        model: str,
-        display_name: str,
-        role_type: str,
-        subject: str,
-        conversation_mode: str,
-        global_instruction: str,
-        act_name: str,
-        act_goal: str,
-        persona_prompt: str,
-        history: list[ChatMessage],
-        priority_message: ChatMessage | None,
-    ) -> str:
-        return f"[{act_name}] {subject}"
-
-
-class FailingLLM:
-    async def generate_reply(
-        self,
-        *,
-        model: str,
-        display_name: str,
-        role_type: str,
-        subject: str,
-        conversation_mode: str,
-        global_instruction: str,
-        act_name: str,
-        act_goal: str,
-        persona_prompt: str,
-        history: list[ChatMessage],
-        priority_message: ChatMessage | None,
-    ) -> str:
-        raise RuntimeError("boom")
+from app.openrouter import HISTORY_MAX_CHARS, OpenRouterClient, format_priority_line
+from app.orchestrator import (
+    RoomManager,
+    advance_history_start,
+    choose_next_speaker,
+    choose_next_speakers,
+    failure_backoff_seconds,
+    resolve_act,
+)
+
+
+class RecordingWebSocket:
+    def __init__(self) -> None:
+        self.frames: list[str] = []
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(data)
+
+
+class ClosedWebSocket:
+    def __init__(self) -> None:
+        self.close_codes: list[int] = []
+
+    async def send_text(self, data: str) -> None:
+        raise RuntimeError("closed")
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_codes.append(code)
+        raise RuntimeError("already closed")
+
+
+class StalledWebSocket:
+    def __init__(self) -> None:
+        self.close_codes: list[int] = []
+
+    async def send_text(self, data: str) -> None:
+        await asyncio.sleep(10)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_codes.append(code)
+
+
+class UnclosableWebSocket:
+    def __init__(self) -> None:
+        self.close_codes: list[int] = []
+
+    async def send_text(self, data: str) -> None:
+        raise RuntimeError("closed")
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_codes.append(code)
+        await asyncio.sleep(10)
 
 
 def _build_settings(
@@ -53,14 +71,21 @@ def _build_settings(
     default_max_rounds: int = 8,
     history_limit: int = 5,
     max_consecutive_failures: int = 2,
-    loop_interval_seconds: float = 0.0,
+    min_failure_backoff_seconds: float = 0.001,
+    max_concurrent_llm_calls: int = 16,
+    ws_send_timeout_seconds: float = 5.0,
+    parallel_agents_per_round: int = 1,
 ) -> Settings:
-    return Settings(
+    return Settings(  # type: ignore[call-arg]
+        _env_file=None,
         openrouter_api_key="test",
         default_max_rounds=default_max_rounds,
         history_limit=history_limit,
         max_consecutive_failures=max_consecutive_failures,
-        loop_interval_seconds=loop_interval_seconds,
+        min_failure_backoff_seconds=min_failure_backoff_seconds,
+        max_concurrent_llm_calls=max_concurrent_llm_calls,
+        ws_send_timeout_seconds=ws_send_timeout_seconds,
+        parallel_agents_per_round=parallel_agents_per_round,
     )
 
 
@@ -87,10 +112,129 @@ def test_choose_next_speaker_excludes_last_speaker() -> None:
     assert speaker.agent_id == "a2"
 
 
-def test_trim_history_respects_limit() -> None:
+@pytest.mark.parametrize("last_speaker_id", [None, "a1", "a3", "a5"])
+def test_choose_next_speaker_matches_choice_over_other_agents(last_speaker_id: str | None) -> None:
+    agents = [
+        AgentSpec(
+            agent_id=f"a{index}",
+            model=f"m{index}",
+            display_name=f"m{index}",
+            role_type="character",
+            character_profile="",
+            persona_prompt="",
+        )
+        for index in range(1, 6)
+    ]
+    candidates = [agent for agent in agents if agent.agent_id != last_speaker_id]
+    rng, reference = Random(7), Random(7)
+    for _ in range(50):
+        speaker = choose_next_speaker(agents=agents, last_speaker_id=last_speaker_id, rng=rng)
+        assert speaker is reference.choice(candidates)
+
+
+def test_choose_next_speakers_picks_distinct_agents() -> None:
+    agents = [
+        AgentSpec(
+            agent_id=f"a{index}",
+            model=f"m{index}",
+            display_name=f"m{index}",
+            role_type="character",
+            character_profile="",
+            persona_prompt="",
+        )
+        for index in range(1, 5)
+    ]
+    speakers = choose_next_speakers(agents=agents, last_speaker_id="a1", rng=Random(3), count=3)
+    assert len({speaker.agent_id for speaker in speakers}) == 3
+    assert all(speaker.agent_id != "a1" for speaker in speakers)
+
+
+def test_failure_backoff_doubles_until_cap() -> None:
+    delays = [
+        failure_backoff_seconds(fail_streak=streak, base=0.5, cap=3.0) for streak in range(1, 6)
+    ]
+    assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+    assert failure_backoff_seconds(fail_streak=3, base=2.0, cap=1.0) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_failing_room_backs_off_even_with_zero_turn_interval() -> None:
+    manager = RoomManager(
+        llm_client=FakeLLM(error=RuntimeError("boom")),
+        settings=_build_settings(max_consecutive_failures=3, min_failure_backoff_seconds=0.05),
+    )
+    room = manager.create_room(
+        subject="障害",
+        models=["m1", "m2"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=17,
+    )
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await manager.start_room(room.room_id)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
+
+    # Two retries before the third failure stops the room: 0.05 s, then 0.1 s.
+    assert room.end_reason == "failures"
+    assert loop.time() - started >= 0.14
+
+
+def test_advance_history_start_respects_limit() -> None:
     messages = [ChatMessage(role="user", speaker_id="user", content=str(i)) for i in range(6)]
-    trimmed = trim_history(messages, limit=3)
-    assert [item.content for item in trimmed] == ["3", "4", "5"]
+    start = advance_history_start(messages, 0, limit=3)
+    assert [item.content for item in messages[start:]] == ["2", "3", "4", "5"]
+    assert advance_history_start(messages, 0, limit=1) == 5
+
+
+def test_advance_history_start_keeps_prefix_stable_between_evictions() -> None:
+    limit = 4
+    messages = [ChatMessage(role="agent", speaker_id="m", content=str(i)) for i in range(11)]
+    start = 0
+    starts: list[int] = []
+    for message_count in range(1, 12):
+        start = advance_history_start(messages[:message_count], start, limit)
+        assert min(message_count, limit) <= message_count - start <= limit + limit // 2
+        starts.append(start)
+    assert starts == [0, 0, 0, 0, 0, 0, 2, 2, 4, 4, 6]
+
+
+@pytest.mark.parametrize("priority_chars", [0, 1000])
+def test_advance_history_start_keeps_whole_messages_within_char_budget(
+    priority_chars: int,
+) -> None:
+    limit = 16
+    priority = (
+        ChatMessage(role="user", speaker_id="user", content="p" * priority_chars)
+        if priority_chars
+        else None
+    )
+    reserved = len(format_priority_line(priority)) + 1 if priority is not None else 0
+    messages: list[ChatMessage] = []
+    start = 0
+    starts: set[int] = set()
+    for turn in range(80):
+        speaker_id = f"model-{turn % 3}"
+        messages.append(ChatMessage(role="agent", speaker_id=speaker_id, content="x" * 240))
+        start = advance_history_start(messages, start, limit, reserved_chars=reserved)
+        starts.add(start)
+        rendered = OpenRouterClient._render_history(messages[start:], priority)
+        assert not rendered.startswith("（履歴が長いため末尾のみ利用）")
+        assert len(rendered) <= HISTORY_MAX_CHARS
+        if priority is None:
+            assert len(messages) - start >= min(len(messages), limit)
+    # Evictions happen in chunks, so the window start changes only every few turns.
+    assert len(starts) <= 80 // (limit // 2) + 1
+
+
+def test_advance_history_start_keeps_newest_oversized_message() -> None:
+    messages = [
+        ChatMessage(role="agent", speaker_id="m", content="a" * 100),
+        ChatMessage(role="agent", speaker_id="m", content="b" * 7000),
+    ]
+    assert advance_history_start(messages, 0, limit=16) == 1
 
 
 def test_resolve_act_changes_with_progress() -> None:
@@ -102,7 +246,7 @@ def test_resolve_act_changes_with_progress() -> None:
 
 @pytest.mark.asyncio
 async def test_room_loop_finishes_with_summary_on_max_rounds() -> None:
-    manager = RoomManager(llm_client=StaticLLM(), settings=_build_settings(default_max_rounds=6))
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings(default_max_rounds=6))
     room = manager.create_room(
         subject="ピザ論争",
         models=["m1", "m2"],
@@ -113,7 +257,7 @@ async def test_room_loop_finishes_with_summary_on_max_rounds() -> None:
     )
 
     await manager.start_room(room.room_id)
-    await asyncio.sleep(0.06)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
 
     assert room.running is False
     assert room.end_reason == "max_rounds"
@@ -124,7 +268,7 @@ async def test_room_loop_finishes_with_summary_on_max_rounds() -> None:
 @pytest.mark.asyncio
 async def test_room_stops_after_consecutive_failures() -> None:
     manager = RoomManager(
-        llm_client=FailingLLM(),
+        llm_client=FakeLLM(error=RuntimeError("boom")),
         settings=_build_settings(max_consecutive_failures=2),
     )
     room = manager.create_room(
@@ -137,7 +281,7 @@ async def test_room_stops_after_consecutive_failures() -> None:
     )
 
     await manager.start_room(room.room_id, max_rounds=10)
-    await asyncio.sleep(0.05)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
 
     assert room.running is False
     assert room.fail_streak >= 2
@@ -146,7 +290,7 @@ async def test_room_stops_after_consecutive_failures() -> None:
 
 @pytest.mark.asyncio
 async def test_room_emits_generation_logs() -> None:
-    manager = RoomManager(llm_client=StaticLLM(), settings=_build_settings(default_max_rounds=2))
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings(default_max_rounds=2))
     room = manager.create_room(
         subject="ログ確認",
         models=["m1", "m2"],
@@ -157,7 +301,7 @@ async def test_room_emits_generation_logs() -> None:
     )
 
     await manager.start_room(room.room_id)
-    await asyncio.sleep(0.05)
+    await wait_for(lambda: any(log.status == "completed" for log in room.generation_logs))
 
     assert room.generation_logs
     statuses = {log.status for log in room.generation_logs}
@@ -168,8 +312,8 @@ async def test_room_emits_generation_logs() -> None:
 @pytest.mark.asyncio
 async def test_room_can_be_concluded_by_user() -> None:
     manager = RoomManager(
-        llm_client=StaticLLM(),
-        settings=_build_settings(default_max_rounds=500, loop_interval_seconds=0.02),
+        llm_client=FakeLLM(),
+        settings=_build_settings(default_max_rounds=500),
     )
     room = manager.create_room(
         subject="自由意志",
@@ -183,17 +327,70 @@ async def test_room_can_be_concluded_by_user() -> None:
     await manager.start_room(room.room_id)
     await asyncio.sleep(0)
     await manager.stop_room(room.room_id, reason="user_concluded")
-    await asyncio.sleep(0.03)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
+
+    assert room.running is False
+    assert room.end_reason == "user_concluded"
+
+
+@pytest.mark.asyncio
+async def test_room_stopped_before_first_turn_is_finished() -> None:
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings())
+    room = manager.create_room(
+        subject="即終了",
+        models=["m1", "m2"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=16,
+    )
+
+    await manager.start_room(room.room_id)
+    await manager.stop_room(room.room_id, reason="user_concluded")
 
+    await asyncio.wait_for(room.finished.wait(), timeout=0.5)
     assert room.running is False
     assert room.end_reason == "user_concluded"
+    assert room.rounds_completed == 0
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stops_running_rooms() -> None:
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings(default_max_rounds=500))
+    rooms = [
+        manager.create_room(
+            subject=f"停止{index}",
+            models=["m1", "m2"],
+            conversation_mode="philosophy_debate",
+            global_instruction="",
+            turn_interval_seconds=0.01,
+            seed=index,
+        )
+        for index in range(2)
+    ]
+    idle = manager.create_room(
+        subject="未開始",
+        models=["m1"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=3,
+    )
+    for room in rooms:
+        await manager.start_room(room.room_id)
+
+    await manager.shutdown()
+
+    assert all(room.task is None and not room.running for room in rooms)
+    assert all(room.end_reason == "server_shutdown" for room in rooms)
+    assert idle.end_reason is None
 
 
 @pytest.mark.asyncio
 async def test_room_can_pause_and_resume_without_advancing_rounds() -> None:
     manager = RoomManager(
-        llm_client=StaticLLM(),
-        settings=_build_settings(default_max_rounds=500, loop_interval_seconds=0.01),
+        llm_client=FakeLLM(),
+        settings=_build_settings(default_max_rounds=500),
     )
     room = manager.create_room(
         subject="意識",
@@ -205,7 +402,7 @@ async def test_room_can_pause_and_resume_without_advancing_rounds() -> None:
     )
 
     await manager.start_room(room.room_id)
-    await asyncio.sleep(0.08)
+    await wait_for(lambda: room.rounds_completed >= 1)
 
     await manager.pause_room(room.room_id)
     await asyncio.sleep(0.03)
@@ -217,15 +414,47 @@ async def test_room_can_pause_and_resume_without_advancing_rounds() -> None:
 
     await manager.resume_room(room.room_id)
     assert room.paused is False
-    await asyncio.sleep(0.08)
-    assert room.rounds_completed > paused_rounds
+    await wait_for(lambda: room.rounds_completed > paused_rounds)
 
     await manager.stop_room(room.room_id, reason="manual_stop")
 
 
+@pytest.mark.asyncio
+async def test_paused_room_blocks_on_resumed_event() -> None:
+    manager = RoomManager(
+        llm_client=FakeLLM(),
+        settings=_build_settings(default_max_rounds=3),
+    )
+    room = manager.create_room(
+        subject="再開",
+        models=["m1", "m2"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=15,
+    )
+
+    await manager.start_room(room.room_id)
+    await manager.pause_room(room.room_id)
+    await asyncio.sleep(0.01)
+    assert room.task is not None and not room.task.done()
+    assert not room.finished.is_set()
+    assert room.rounds_completed == 0
+    # The loop is parked on the event itself rather than sleeping between polls.
+    assert not room.resumed.is_set()
+    assert len(room.resumed._waiters) == 1
+
+    loop = asyncio.get_running_loop()
+    resumed_at = loop.time()
+    await manager.resume_room(room.room_id)
+    await asyncio.wait_for(room.finished.wait(), timeout=0.5)
+    assert room.end_reason == "max_rounds"
+    assert loop.time() - resumed_at < 0.05
+
+
 @pytest.mark.asyncio
 async def test_update_room_config_rebuilds_personas_before_start() -> None:
-    manager = RoomManager(llm_client=StaticLLM(), settings=_build_settings(default_max_rounds=10))
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings(default_max_rounds=10))
     room = manager.create_room(
         subject="意識のハードプロブレム",
         models=["m1", "m2", "m3"],
@@ -251,7 +480,7 @@ async def test_update_room_config_rebuilds_personas_before_start() -> None:
 
 @pytest.mark.asyncio
 async def test_update_room_config_rejects_mode_change_while_running() -> None:
-    manager = RoomManager(llm_client=StaticLLM(), settings=_build_settings(default_max_rounds=300))
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings(default_max_rounds=300))
     room = manager.create_room(
         subject="自由意志",
         models=["m1", "m2"],
@@ -266,3 +495,207 @@ async def test_update_room_config_rejects_mode_change_while_running() -> None:
         await manager.update_room_config(room.room_id, conversation_mode="consensus_lab")
 
     await manager.stop_room(room.room_id, reason="manual_stop")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_same_frame_to_every_connection() -> None:
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings())
+    room = manager.create_room(
+        subject="配信",
+        models=["m1", "m2"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=11,
+    )
+    sockets = [RecordingWebSocket(), RecordingWebSocket()]
+    for socket in sockets:
+        await manager.register_ws(room.room_id, cast(WebSocket, socket))
+
+    await manager.add_user_message(room.room_id, "こんにちは")
+
+    snapshot = json.loads(sockets[0].frames[0])
+    assert snapshot["type"] == "room_snapshot"
+    assert sockets[0].frames[1] == sockets[1].frames[1]
+    event = json.loads(sockets[0].frames[1])
+    assert event["type"] == "message"
+    assert event["payload"]["content"] == "こんにちは"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_drops_failed_connections() -> None:
+    manager = RoomManager(llm_client=FakeLLM(), settings=_build_settings())
+    room = manager.create_room(
+        subject="切断",
+        models=["m1"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=12,
+    )
+    alive = RecordingWebSocket()
+    await manager.register_ws(room.room_id, cast(WebSocket, alive))
+    closed = ClosedWebSocket()
+    room.ws_connections.add(cast(WebSocket, closed))
+
+    await manager.add_user_message(room.room_id, "届く？")
+
+    assert room.ws_connections == {cast(WebSocket, alive)}
+    assert json.loads(alive.frames[-1])["payload"]["content"] == "届く？"
+    await wait_for(lambda: closed.close_codes == [1011])
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_bounded_across_rooms() -> None:
+    llm = FakeLLM(delay=0.01)
+    manager = RoomManager(
+        llm_client=llm,
+        settings=_build_settings(default_max_rounds=2, max_concurrent_llm_calls=1),
+    )
+    rooms = [
+        manager.create_room(
+            subject=f"同時実行{index}",
+            models=["m1", "m2"],
+            conversation_mode="philosophy_debate",
+            global_instruction="",
+            turn_interval_seconds=0.0,
+            seed=index,
+        )
+        for index in range(3)
+    ]
+
+    for room in rooms:
+        await manager.start_room(room.room_id)
+    await asyncio.wait_for(asyncio.gather(*(room.finished.wait() for room in rooms)), timeout=1.0)
+
+    assert all(room.end_reason == "max_rounds" for room in rooms)
+    assert llm.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_agents_reply_concurrently_within_a_round() -> None:
+    llm = FakeLLM(delay=0.01)
+    manager = RoomManager(
+        llm_client=llm,
+        settings=_build_settings(default_max_rounds=4, parallel_agents_per_round=2),
+    )
+    room = manager.create_room(
+        subject="並列",
+        models=["m1", "m2", "m3"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=21,
+    )
+
+    await manager.start_room(room.room_id)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
+
+    agent_messages = [
+        message
+        for message in room.messages
+        if message.role == "agent" and message.speaker_id != "総括"
+    ]
+    assert room.end_reason == "max_rounds"
+    assert len(agent_messages) == 4
+    assert llm.max_in_flight == 2
+    assert agent_messages[0].speaker_id != agent_messages[1].speaker_id
+
+
+@pytest.mark.asyncio
+async def test_parallel_batch_logs_every_speaker_when_failures_stop_the_room() -> None:
+    manager = RoomManager(
+        llm_client=FakeLLM(error=RuntimeError("boom")),
+        settings=_build_settings(max_consecutive_failures=2, parallel_agents_per_round=3),
+    )
+    room = manager.create_room(
+        subject="並列失敗",
+        models=["m1", "m2", "m3", "m4"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=22,
+    )
+
+    await manager.start_room(room.room_id)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
+
+    assert room.end_reason == "failures"
+    requested = [log.display_name for log in room.generation_logs if log.status == "requesting"]
+    failed = [log for log in room.generation_logs if log.status == "failed"]
+    assert len(requested) == 3
+    assert sorted(log.display_name for log in failed) == sorted(requested)
+    assert failed[-1].detail == "Reply discarded: room stopped after consecutive failures."
+
+
+@pytest.mark.asyncio
+async def test_broadcast_drops_connections_that_stall() -> None:
+    manager = RoomManager(
+        llm_client=FakeLLM(),
+        settings=_build_settings(ws_send_timeout_seconds=0.01),
+    )
+    room = manager.create_room(
+        subject="遅延",
+        models=["m1"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=13,
+    )
+    alive = RecordingWebSocket()
+    await manager.register_ws(room.room_id, cast(WebSocket, alive))
+    stalled = StalledWebSocket()
+    room.ws_connections.add(cast(WebSocket, stalled))
+
+    await asyncio.wait_for(manager.add_user_message(room.room_id, "待てない"), timeout=1.0)
+
+    assert room.ws_connections == {cast(WebSocket, alive)}
+    assert json.loads(alive.frames[-1])["payload"]["content"] == "待てない"
+    await wait_for(lambda: stalled.close_codes == [1011])
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_pending_socket_closes() -> None:
+    manager = RoomManager(
+        llm_client=FakeLLM(),
+        settings=_build_settings(ws_send_timeout_seconds=0.05),
+    )
+    room = manager.create_room(
+        subject="後始末",
+        models=["m1"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=16,
+    )
+    unclosable = UnclosableWebSocket()
+    room.ws_connections.add(cast(WebSocket, unclosable))
+
+    await manager.add_user_message(room.room_id, "閉じない")
+    assert manager._closing_sockets
+
+    await asyncio.wait_for(manager.shutdown(), timeout=1.0)
+
+    assert not manager._closing_sockets
+    assert unclosable.close_codes == [1011]
+
+
+@pytest.mark.asyncio
+async def test_queued_user_messages_are_each_delivered_as_priority() -> None:
+    llm = FakeLLM()
+    manager = RoomManager(llm_client=llm, settings=_build_settings(default_max_rounds=3))
+    room = manager.create_room(
+        subject="割り込み",
+        models=["m1", "m2"],
+        conversation_mode="philosophy_debate",
+        global_instruction="",
+        turn_interval_seconds=0.0,
+        seed=14,
+    )
+
+    await manager.add_user_message(room.room_id, "一つ目")
+    await manager.add_user_message(room.room_id, "二つ目")
+    await manager.start_room(room.room_id)
+    await asyncio.wait_for(room.finished.wait(), timeout=1.0)
+
+    assert llm.priority_contents == ["一つ目", "二つ目", None]
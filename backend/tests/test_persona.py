@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from random import Random
 
-from app.persona import build_display_names, build_persona_prompt, generate_personas
+from app.persona import (
+    CHARACTER_PROMPT_HEADER,
+    FACILITATOR_PROMPT_HEADER,
+    build_display_names,
+    build_persona_prompt,
+    generate_personas,
+)
 
 
 def test_build_display_names_handles_duplicates() -> None:
@@ -27,6 +33,8 @@ def test_build_persona_prompt_for_roles() -> None:
     )
     assert "司会" in facilitator
     assert "キャラクター設定" in character
+    assert facilitator.startswith(FACILITATOR_PROMPT_HEADER)
+    assert character.startswith(CHARACTER_PROMPT_HEADER)
 
 
 def test_generate_personas_assigns_first_as_facilitator() -> None:
@@ -116,6 +116,7 @@ const END_REASON_LABEL: Record<string, string> = {
   manual_stop: '手動停止',
   user_concluded: '発展なしで終了',
   failures: '連続エラー',
+  server_shutdown: 'サーバー停止',
 }
 
 const SPEAKER_ACCENT_COLORS = [